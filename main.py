@@ -9,18 +9,24 @@ Environment variables required:
   - GOOGLE_CREDENTIALS_FILE (GitLab "File" variable path), OR
   - GOOGLE_CREDENTIALS (raw JSON string), OR
   - GOOGLE_CREDENTIALS (a path to a local JSON file)
+Optional:
+- TOKEN_CACHE_FILE (reuse the Sheets access token across runs until it nears expiry; off if unset)
 """
 
 import os
 import re
 import sys
 import json
+import time
+import random
 import asyncio
-import pandas as pd
-from datetime import datetime
-from urllib.parse import urljoin, urlparse, parse_qs
+import functools
+from datetime import datetime, timezone
+from html.parser import HTMLParser
 
+import httplib2
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp, Request as HttplibRequest
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
@@ -31,6 +37,11 @@ from playwright.async_api import async_playwright, TimeoutError as PlaywrightTim
 # -----------------------------
 BASE_URL = "https://salesweb.civilview.com/"
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SHEETS_MAX_RETRIES = 6
+SHEETS_RETRY_STATUSES = {429, 500, 503}
+SHEETS_HTTP_TIMEOUT = 60
+TOKEN_CACHE_FILE = os.environ.get("TOKEN_CACHE_FILE")
+TOKEN_MIN_TTL_SECONDS = 30
 
 TARGET_COUNTIES = [
     {"county_id": "52", "county_name": "Cape May County, NJ"},
@@ -49,17 +60,43 @@ TARGET_COUNTIES = [
 
 POLITE_DELAY_SECONDS = 1.5
 MAX_RETRIES = 5
+MAX_PARALLEL_COUNTIES = 3
+MAX_PARALLEL_DETAILS = 4
+NAV_TIMEOUT_MS = 15000
+MAX_BACKOFF_SECONDS = 30
+
+# Headless flags that cut CPU/memory on CI runners
+BROWSER_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-blink-features=AutomationControlled",
+]
+
+# We only read text, so skip everything that doesn't carry it
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media", "other"}
+BLOCKED_URL_PARTS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar")
+
+# -----------------------------
+# Retry helpers
+# -----------------------------
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so concurrent retries don't fire in lockstep."""
+    return min(MAX_BACKOFF_SECONDS, (2 ** attempt) * (0.5 + random.random()))
 
 # -----------------------------
 # Credential helpers
 # -----------------------------
+@functools.lru_cache(maxsize=1)
 def load_service_account_info():
     """
     Loads service account JSON from:
     1) GOOGLE_CREDENTIALS_FILE (File variable path) OR
     2) GOOGLE_CREDENTIALS raw JSON string OR
     3) GOOGLE_CREDENTIALS path to local file
-    Returns parsed dict or raises ValueError.
+    Returns parsed dict or raises ValueError. Parsed once per process.
     """
     file_env = os.environ.get("GOOGLE_CREDENTIALS_FILE")
     if file_env:
@@ -94,11 +131,45 @@ def load_service_account_info():
 
     raise ValueError("GOOGLE_CREDENTIALS is set but not valid JSON and not an existing file path.")
 
+def load_cached_token(creds, account: str) -> bool:
+    """Put a still-valid cached access token on creds; True if one was used."""
+    if not TOKEN_CACHE_FILE or not os.path.exists(TOKEN_CACHE_FILE):
+        return False
+    try:
+        with open(TOKEN_CACHE_FILE, "r", encoding="utf-8") as fh:
+            cached = json.load(fh)
+        # google-auth keeps expiry as naive UTC
+        expiry = datetime.fromisoformat(cached["expiry"])
+        if cached.get("account") != account or (expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds() <= TOKEN_MIN_TTL_SECONDS:
+            return False
+        creds.token, creds.expiry = cached["token"], expiry
+        return True
+    except Exception as e:
+        print(f"⚠ Ignoring unreadable token cache {TOKEN_CACHE_FILE}: {e}")
+        return False
+
+def save_cached_token(creds, account: str):
+    if not TOKEN_CACHE_FILE or not creds.token or not creds.expiry:
+        return
+    try:
+        with open(os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as fh:
+            json.dump({"account": account, "token": creds.token, "expiry": creds.expiry.isoformat()}, fh)
+    except Exception as e:
+        print(f"⚠ Could not save token cache {TOKEN_CACHE_FILE}: {e}")
+
 def init_sheets_service_from_env():
     info = load_service_account_info()
     try:
         creds = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
-        service = build('sheets', 'v4', credentials=creds)
+        raw_http = httplib2.Http(timeout=SHEETS_HTTP_TIMEOUT)
+        account = info.get("client_email", "")
+        if TOKEN_CACHE_FILE and not load_cached_token(creds, account):
+            # fetch the token now so it can be cached for the next run
+            creds.refresh(HttplibRequest(raw_http))
+            save_cached_token(creds, account)
+        # one authorized keep-alive transport for every call; bundled discovery doc, no cache file IO
+        http = AuthorizedHttp(creds, http=raw_http)
+        service = build('sheets', 'v4', http=http, cache_discovery=False, static_discovery=True)
         return service
     except Exception as e:
         raise RuntimeError(f"Failed to create Google Sheets client: {e}")
@@ -111,171 +182,506 @@ class SheetsClient:
         self.spreadsheet_id = spreadsheet_id
         self.service = service
         self.svc = self.service.spreadsheets()
-
+        self._pending_requests = []
+        self._pending_sheets = 0
+        self._info_cache = None
+        self._props_cache = None
+
+    def _execute(self, request):
+        """Execute a Sheets API request, backing off on quota (429) and transient 5xx errors."""
+        for attempt in range(SHEETS_MAX_RETRIES):
+            try:
+                return request.execute()
+            except HttpError as e:
+                status = getattr(e.resp, "status", None)
+                if status not in SHEETS_RETRY_STATUSES or attempt == SHEETS_MAX_RETRIES - 1:
+                    raise
+                retry_after = e.resp.get("retry-after") if hasattr(e.resp, "get") else None
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = -1
+                if not delay >= 0:  # missing, negative or NaN: use our own backoff
+                    delay = backoff_delay(attempt)
+                # a huge Retry-After would otherwise stall the whole run
+                delay = min(MAX_BACKOFF_SECONDS, delay)
+                print(f"⚠ Sheets API {status}, retrying in {delay:.1f}s ({attempt+1}/{SHEETS_MAX_RETRIES})")
+                time.sleep(delay)
+
+    # metadata is fetched once per run; addSheet keeps the cache in sync
     def spreadsheet_info(self):
-        try:
-            return self.svc.get(spreadsheetId=self.spreadsheet_id).execute()
-        except HttpError as e:
-            print(f"⚠ Error fetching spreadsheet info: {e}")
-            return {}
+        if self._info_cache is None:
+            try:
+                self._info_cache = self._execute(self.svc.get(spreadsheetId=self.spreadsheet_id))
+            except HttpError as e:
+                print(f"⚠ Error fetching spreadsheet info: {e}")
+                return {}
+        return self._info_cache
+
+    def _sheet_props(self):
+        """{title: sheet properties} from the cached metadata, for O(1) lookups."""
+        if self._props_cache is None:
+            info = self.spreadsheet_info()
+            self._props_cache = {s['properties']['title']: s['properties'] for s in info.get('sheets', [])}
+        return self._props_cache
 
     def sheet_exists(self, sheet_name: str) -> bool:
-        info = self.spreadsheet_info()
-        for s in info.get('sheets', []):
-            if s['properties']['title'] == sheet_name:
-                return True
-        return False
+        return sheet_name in self._sheet_props()
 
-    def create_sheet_if_missing(self, sheet_name: str):
-        if self.sheet_exists(sheet_name):
-            return
-        try:
-            req = {"addSheet": {"properties": {"title": sheet_name}}}
-            self.svc.batchUpdate(spreadsheetId=self.spreadsheet_id, body={"requests": [req]}).execute()
-            print(f"✓ Created sheet: {sheet_name}")
-        except HttpError as e:
-            print(f"⚠ create_sheet_if_missing error on '{sheet_name}': {e}")
-
-    def get_values(self, sheet_name: str, rng: str = "A:Z"):
+    def ensure_sheets(self, sheet_names):
+        """Create every missing sheet with one batchUpdate; returns the titles that were created."""
+        missing = [name for name in dict.fromkeys(sheet_names) if not self.sheet_exists(name)]
+        if not missing:
+            return []
         try:
-            res = self.svc.values().get(spreadsheetId=self.spreadsheet_id, range=f"'{sheet_name}'!{rng}").execute()
-            return res.get("values", [])
+            reqs = [{"addSheet": {"properties": {"title": name}}} for name in missing]
+            res = self._execute(self.svc.batchUpdate(spreadsheetId=self.spreadsheet_id, body={"requests": reqs}))
         except HttpError as e:
+            print(f"⚠ ensure_sheets error on {missing}: {e}")
             return []
+        for reply in res.get("replies", []):
+            props = reply["addSheet"]["properties"]
+            self.spreadsheet_info().setdefault("sheets", []).append({"properties": props})
+            self._sheet_props()[props["title"]] = props
+        print(f"✓ Created sheets: {', '.join(missing)}")
+        return missing
 
-    def clear(self, sheet_name: str, rng: str = "A:Z"):
+    def create_sheet_if_missing(self, sheet_name: str):
+        self.ensure_sheets([sheet_name])
+
+    def batch_get(self, ranges):
+        """Fetch several A1 ranges in one values.batchGet; returns {range: values}."""
+        if not ranges:
+            return {}
         try:
-            self.svc.values().clear(spreadsheetId=self.spreadsheet_id, range=f"'{sheet_name}'!{rng}").execute()
+            res = self._execute(self.svc.values().batchGet(spreadsheetId=self.spreadsheet_id, ranges=ranges))
         except HttpError as e:
-            print(f"⚠ clear error on '{sheet_name}': {e}")
+            print(f"⚠ batch_get error: {e}")
+            return {}
+        return {rng: vr.get("values", []) for rng, vr in zip(ranges, res.get("valueRanges", []))}
+
+    def _format_requests(self, sheet_name: str, values):
+        # --- Beautify: bold header, freeze row, auto resize ---
+        sheet_id = self._get_sheet_id(sheet_name)
+        return [
+            {"repeatCell": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "startRowIndex": 1,
+                    "endRowIndex": 2
+                },
+                "cell": {"userEnteredFormat": {"textFormat": {"bold": True}}},
+                "fields": "userEnteredFormat.textFormat.bold"
+            }},
+            {"updateSheetProperties": {
+                "properties": {"sheetId": sheet_id,
+                               "gridProperties": {"frozenRowCount": 2}},
+                "fields": "gridProperties.frozenRowCount"
+            }},
+            {"autoResizeDimensions": {
+                "dimensions": {
+                    "sheetId": sheet_id,
+                    "dimension": "COLUMNS",
+                    "startIndex": 0,
+                    "endIndex": len(values[0]) if values else 10
+                }
+            }}
+        ]
 
-    def write_values(self, sheet_name: str, values, start_cell: str = "A1"):
+    # --- batched writes: queue per-sheet rewrites, send them all in one batchUpdate ---
+    def _grid_properties(self, sheet_name: str):
+        props = self._sheet_props().get(sheet_name)
+        return props.setdefault('gridProperties', {}) if props is not None else {}
+
+    @staticmethod
+    def _cells_request(sheet_id, values):
+        return {"updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+            "rows": [{"values": [{"userEnteredValue": {"stringValue": str(v)}} for v in row]} for row in values],
+            "fields": "userEnteredValue"
+        }}
+
+    def _queueable_sheet_id(self, sheet_name: str):
+        # a missing sheetId would be sent as null, which the API treats as sheet 0
+        sheet_id = self._get_sheet_id(sheet_name)
+        if sheet_id is None:
+            print(f"⚠ No sheetId for '{sheet_name}' (was it created?); skipping its write")
+        return sheet_id
+
+    def queue_values(self, sheet_name: str, values) -> bool:
+        sheet_id = self._queueable_sheet_id(sheet_name)
+        if sheet_id is None:
+            return False
+        # clear old values (formatting is kept), then make sure the grid is tall enough
+        reqs = [{"updateCells": {"range": {"sheetId": sheet_id}, "fields": "userEnteredValue"}}]
+        grid = self._grid_properties(sheet_name)
+        missing = len(values) - grid.get("rowCount", 1000)
+        if missing > 0:
+            reqs.append({"appendDimension": {"sheetId": sheet_id, "dimension": "ROWS", "length": missing}})
+            grid["rowCount"] = len(values)
+        reqs.append(self._cells_request(sheet_id, values))
+        reqs.extend(self._format_requests(sheet_name, values))
+        self._pending_requests.extend(reqs)
+        self._pending_sheets += 1
+        return True
+
+    def queue_prepend(self, sheet_name: str, values) -> bool:
+        # insert blank rows at the top and write only into them; history never moves over the wire
+        sheet_id = self._queueable_sheet_id(sheet_name)
+        if sheet_id is None:
+            return False
+        grid = self._grid_properties(sheet_name)
+        grid["rowCount"] = grid.get("rowCount", 1000) + len(values)
+        self._pending_requests.append({"insertDimension": {
+            "range": {
+                "sheetId": sheet_id,
+                "dimension": "ROWS",
+                "startIndex": 0,
+                "endIndex": len(values)
+            },
+            "inheritFromBefore": False
+        }})
+        self._pending_requests.append(self._cells_request(sheet_id, values))
+        self._pending_requests.extend(self._format_requests(sheet_name, values))
+        self._pending_sheets += 1
+        return True
+
+    def flush_batched(self):
+        if not self._pending_requests:
+            return
         try:
-            self.svc.values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"'{sheet_name}'!{start_cell}",
-                valueInputOption="USER_ENTERED",
-                body={"values": values}
-            ).execute()
-
-            # --- Beautify: bold header, freeze row, auto resize ---
-            self.svc.batchUpdate(
+            self._execute(self.svc.batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
-                body={
-                    "requests": [
-                        {"repeatCell": {
-                            "range": {
-                                "sheetId": self._get_sheet_id(sheet_name),
-                                "startRowIndex": 1,
-                                "endRowIndex": 2
-                            },
-                            "cell": {"userEnteredFormat": {"textFormat": {"bold": True}}},
-                            "fields": "userEnteredFormat.textFormat.bold"
-                        }},
-                        {"updateSheetProperties": {
-                            "properties": {"sheetId": self._get_sheet_id(sheet_name),
-                                           "gridProperties": {"frozenRowCount": 2}},
-                            "fields": "gridProperties.frozenRowCount"
-                        }},
-                        {"autoResizeDimensions": {
-                            "dimensions": {
-                                "sheetId": self._get_sheet_id(sheet_name),
-                                "dimension": "COLUMNS",
-                                "startIndex": 0,
-                                "endIndex": len(values[0]) if values else 10
-                            }
-                        }}
-                    ]
-                }
-            ).execute()
+                body={"requests": self._pending_requests}
+            ))
+            print(f"✓ Flushed {self._pending_sheets} sheet writes in one batchUpdate")
         except HttpError as e:
-            print(f"✗ write_values error on '{sheet_name}': {e}")
+            print(f"✗ flush_batched error: {e}")
             raise
+        finally:
+            self._pending_requests, self._pending_sheets = [], 0
 
     def _get_sheet_id(self, sheet_name: str):
-        info = self.spreadsheet_info()
-        for s in info.get('sheets', []):
-            if s['properties']['title'] == sheet_name:
-                return s['properties']['sheetId']
-        return None
+        return self._sheet_props().get(sheet_name, {}).get('sheetId')
 
     # --- snapshot style: prepend only new rows ---
     def prepend_snapshot(self, sheet_name: str, header_row, new_rows):
         if not new_rows:
             print(f"✓ No new rows to prepend in '{sheet_name}'")
-            return
+            return True
         snapshot_header = [[f"Snapshot for {datetime.now().strftime('%A - %Y-%m-%d')}"]]
         payload = snapshot_header + [header_row] + new_rows + [[""]]
-        existing = self.get_values(sheet_name, "A:Z")
-        values = payload + existing
-        self.clear(sheet_name, "A:Z")
-        self.write_values(sheet_name, values, "A1")
+        if not self.queue_prepend(sheet_name, payload):
+            return False
         print(f"✓ Prepended snapshot to '{sheet_name}': {len(new_rows)} new rows")
+        return True
 
     # first run = full overwrite
     def overwrite_with_snapshot(self, sheet_name: str, header_row, all_rows):
         snapshot_header = [[f"Snapshot for {datetime.now().strftime('%A - %Y-%m-%d')}"]]
         values = snapshot_header + [header_row] + all_rows + [[""]]
-        self.clear(sheet_name, "A:Z")
-        self.write_values(sheet_name, values, "A1")
+        if not self.queue_values(sheet_name, values):
+            return False
         print(f"✓ Wrote full snapshot to '{sheet_name}' ({len(all_rows)} rows)")
+        return True
+
+# -----------------------------
+# Dedup helpers
+# -----------------------------
+PID_KEY = (0,)             # county tabs: Property ID
+COUNTY_PID_KEY = (5, 0)    # All Data: (County, Property ID); county is always before Sale Type
+# Only the key columns are read back for dedup
+PID_RANGE = "A:A"
+COUNTY_PID_RANGE = "A:F"
+
+def _data_start(existing) -> int:
+    """Index of the first data row after the (first) Property ID header row."""
+    for idx, row in enumerate(existing[:5]):
+        if row and row[0].lower().replace(" ", "") in {"propertyid", "property id"}:
+            return idx + 1
+    return 2 if len(existing) > 1 else 1
+
+def dedup_against_sheet(existing, rows, key_cols, known_keys=None):
+    """
+    Returns (new_rows, existing_keys): the rows whose key (values at key_cols) is not
+    already present. Keys come from known_keys when given, else from the sheet values.
+    Rows with an empty or missing key column are dropped: they could never be matched,
+    so they would be prepended again on every run.
+    """
+    if known_keys is not None:
+        existing_keys = frozenset(known_keys)
+    elif existing:
+        keys = (
+            tuple(str(r[c]).strip() if c < len(r) else "" for c in key_cols)
+            for r in existing[_data_start(existing):]
+        )
+        existing_keys = frozenset(k for k in keys if all(k))
+    else:
+        existing_keys = frozenset()
+
+    # scraped rows are already normalized, so their keys are compared as-is
+    width = max(key_cols)
+    new_rows = []
+    for r in rows:
+        if len(r) <= width:
+            continue
+        key = tuple(r[c] for c in key_cols)
+        if all(key) and key not in existing_keys:
+            new_rows.append(r)
+    return new_rows, existing_keys
 
 # -----------------------------
 # Scrape helpers
 # -----------------------------
+_PID_RE = re.compile(r"[?&]PropertyId=([^&#]+)", re.I)
+_JUDGMENT_LABEL_RE = re.compile(r"Approx\. Judgment|Approx\. Upset|Approximate Judgment:|Approx Judgment\*|Debt Amount")
+
 def norm_text(s: str) -> str:
     if not s:
         return ""
-    return re.sub(r"\s+", " ", s).strip()
+    # split()/join collapses whitespace in C, no regex dispatch per field
+    return " ".join(s.split())
+
+def column_map(headers) -> dict:
+    """Get column mapping based on headers to handle different table structures."""
+    colmap = {}
+    for i, header in enumerate(headers):
+        htxt = header.strip().lower()
+        if "sale" in htxt and "date" in htxt:
+            colmap["sales_date"] = i
+        elif "defendant" in htxt:
+            colmap["defendant"] = i
+        elif "address" in htxt:
+            colmap["address"] = i
+        elif "judgment" in htxt or _JUDGMENT_LABEL_RE.search(header):
+            colmap["approx_judgment"] = i
+    return colmap
+
+def cell_text(cells, colmap, colname) -> str:
+    """Pick a listing cell by column name from an already-extracted row."""
+    idx = colmap.get(colname)
+    if idx is None or idx >= len(cells):
+        return ""
+    return norm_text(cells[idx])
+
+@functools.lru_cache(maxsize=256)
+def classify_detail_label(label: str) -> str:
+    """
+    Map a details-page label to the field it fills ("" if none); first match wins.
+    Every details page repeats the same handful of labels, so results are cached.
+    """
+    label_low = label.lower()
+    if "address" in label_low:
+        return "address"
+    if _JUDGMENT_LABEL_RE.search(label):
+        return "approx_judgment"
+    if "defendant" in label_low:
+        return "defendant"
+    if "sale" in label_low and "date" in label_low:
+        return "sales_date"
+    if "sale type" in label_low:
+        return "sale_type"
+    return ""
+
+def details_url_for(href: str) -> str:
+    # civilview hrefs are absolute or site-root relative, so no need for urljoin's full parse
+    return href if href.startswith("http") else BASE_URL + href.lstrip("/")
 
 def extract_property_id_from_href(href: str) -> str:
-    try:
-        q = parse_qs(urlparse(href).query)
-        return q.get("PropertyId", [""])[0]
-    except Exception:
-        return ""
+    m = _PID_RE.search(href or "")
+    return m.group(1) if m else ""
+
+class DetailItemsParser(HTMLParser):
+    """Collect label/value text of .sale-detail-item blocks from raw details-page HTML."""
+    VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "wbr"}
+    # block boundaries separate words the way innerText does
+    BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "tr", "td", "th", "table", "dt", "dd", "address"}
+    # tags HTML lets you leave open; a new sibling closes the previous one
+    IMPLIED_END_TAGS = {"p", "li", "dt", "dd", "tr", "td", "th"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []
+        self._item = None
+        self._field = None
+        self._open = []  # tags open inside the current label/value, outermost first
+        self._buf = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._field:
+            if tag == "br" or tag in self.BLOCK_TAGS:
+                self._buf.append(" ")
+            if tag in self.VOID_TAGS:
+                return
+            if tag in self.IMPLIED_END_TAGS and len(self._open) > 1 and self._open[-1] == tag:
+                self._open.pop()
+            self._open.append(tag)
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if "sale-detail-item" in classes:
+            self._item = {}
+        elif self._item is not None and ("sale-detail-label" in classes or "sale-detail-value" in classes):
+            self._field = "label" if "sale-detail-label" in classes else "value"
+            self._open = [tag]
+            self._buf = []
+
+    def handle_endtag(self, tag):
+        if not self._field or tag not in self._open:
+            return
+        if tag in self.BLOCK_TAGS:
+            self._buf.append(" ")
+        # closing a tag also closes anything left open inside it (e.g. an unclosed <p>)
+        while self._open.pop() != tag:
+            pass
+        if self._open:
+            return
+        self._item[self._field] = norm_text("".join(self._buf))
+        self._field = None
+        if "label" in self._item and "value" in self._item:
+            self.items.append(self._item)
+            self._item = None
+
+    def handle_data(self, data):
+        if self._field:
+            self._buf.append(data)
+
+async def block_unneeded_requests(route):
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES or any(p in req.url for p in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Installed once per context; clicks cookie/consent banners on every page load
+BANNER_DISMISS_JS = """document.addEventListener('DOMContentLoaded', () => {
+    for (const b of document.querySelectorAll('button')) {
+        const t = b.innerText || '';
+        if (/Accept|I Agree|Close/i.test(t) || b.matches('.cookie-accept, [aria-label="Close"]')
+            || (b.closest('.modal-footer') && /OK/i.test(t))) {
+            try { b.click(); } catch (e) {}
+        }
+    }
+});"""
+
+# One round-trip per page instead of several locator calls per row/item
+LISTING_JS = """() => {
+    let ths = document.querySelectorAll('table.table.table-striped thead tr th');
+    if (!ths.length) {
+        const first = document.querySelector('table.table.table-striped tr');
+        ths = first ? first.querySelectorAll('th') : [];
+    }
+    const rows = Array.from(document.querySelectorAll('table.table.table-striped tbody tr')).map(tr => {
+        const a = tr.querySelector('td.hidden-print a');
+        return {href: a ? (a.getAttribute('href') || '') : '', cells: Array.from(tr.querySelectorAll('td')).map(td => td.innerText)};
+    });
+    return {headers: Array.from(ths).map(th => th.innerText), rows: rows};
+}"""
+
+DETAIL_ITEMS_JS = """() => Array.from(document.querySelectorAll('.sale-details-list .sale-detail-item')).map(item => {
+    const label = item.querySelector('.sale-detail-label');
+    const value = item.querySelector('.sale-detail-value');
+    if (!label || !value) return null;
+    return {label: label.innerText, value: value.innerText};
+}).filter(Boolean)"""
 
 # -----------------------------
 # Scraper
 # -----------------------------
+class PagePool:
+    """Reusable pages in one context; acquire() waits once `size` pages are all busy."""
+    def __init__(self, context, size: int):
+        self.context = context
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._pages = []
+        self._created = 0
+
+    async def acquire(self):
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1  # reserve the slot before awaiting
+            try:
+                page = await self.context.new_page()
+            except Exception:
+                self._created -= 1
+                raise
+            self._pages.append(page)
+            return page
+        return await self._idle.get()
+
+    def release(self, page):
+        self._idle.put_nowait(page)
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
 class ForeclosureScraper:
-    def __init__(self, sheets_client):
+    def __init__(self, sheets_client, detail_pages: PagePool, http):
         self.sheets_client = sheets_client
+        self.detail_pages = detail_pages
+        self.http = http  # the context's APIRequestContext (shares its cookies)
 
     async def goto_with_retry(self, page, url: str, max_retries=3):
         last_exc = None
         for attempt in range(max_retries):
             try:
-                resp = await page.goto(url, wait_until="networkidle", timeout=60000)
+                resp = await page.goto(url, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
                 if resp and (200 <= resp.status < 300):
                     return resp
-                await asyncio.sleep(2 ** attempt)
+                # 4xx (other than 429) won't change on retry
+                if resp and 400 <= resp.status < 500 and resp.status != 429:
+                    print(f"[WARN] HTTP {resp.status} for {url}, not retrying")
+                    return resp
+                await asyncio.sleep(backoff_delay(attempt))
             except Exception as e:
                 last_exc = e
-                await asyncio.sleep(2 ** attempt)
+                await asyncio.sleep(backoff_delay(attempt))
         if last_exc:
             raise last_exc
         return None
 
-    async def dismiss_banners(self, page):
-        selectors = [
-            "button:has-text('Accept')", "button:has-text('I Agree')",
-            "button:has-text('Close')", "button.cookie-accept",
-            "button[aria-label='Close']", ".modal-footer button:has-text('OK')",
-        ]
-        for sel in selectors:
+    async def fetch_detail_items(self, details_url, max_retries=3):
+        """
+        Details pages are server-rendered, so a plain GET + HTML parse is enough.
+        Falls back to a pooled browser page only if the HTML has no detail items.
+        """
+        for attempt in range(max_retries):
             try:
-                loc = page.locator(sel)
-                if await loc.count():
-                    await loc.first.click(timeout=1500)
-                    await page.wait_for_timeout(200)
+                resp = await self.http.get(details_url, timeout=NAV_TIMEOUT_MS)
+                try:
+                    html = await resp.text() if resp.ok else None
+                finally:
+                    # APIResponse bodies are kept until disposed (or the context closes)
+                    await resp.dispose()
+                if html is not None:
+                    parser = DetailItemsParser()
+                    parser.feed(html)
+                    if parser.items:
+                        return parser.items
+                    break
+                # 4xx (other than 429) won't change on retry
+                if 400 <= resp.status < 500 and resp.status != 429:
+                    print(f"[WARN] HTTP {resp.status} for {details_url}, not retrying")
+                    return []
             except Exception:
                 pass
+            await asyncio.sleep(backoff_delay(attempt))
+
+        page = await self.detail_pages.acquire()
+        try:
+            await self.goto_with_retry(page, details_url)
+            await page.wait_for_selector(".sale-details-list", timeout=15000)
+            return await page.evaluate(DETAIL_ITEMS_JS)
+        finally:
+            self.detail_pages.release(page)
 
-    async def get_details_data(self, page, details_url, list_url, county, current_data):
+    async def get_details_data(self, details_url, county, current_data):
         """Extract additional data from details page."""
         extracted = {
-            "approx_judgment": "",
+            "approx_judgment": current_data.get("approx_judgment", ""),
             "sale_type": "",
             "address": current_data.get("address", ""),
             "defendant": current_data.get("defendant", ""),
@@ -286,40 +692,24 @@ class ForeclosureScraper:
             return extracted
             
         try:
-            await self.goto_with_retry(page, details_url)
-            await self.dismiss_banners(page)
-            await page.wait_for_selector(".sale-details-list", timeout=15000)
-            
-            items = page.locator(".sale-details-list .sale-detail-item")
-            for j in range(await items.count()):
+            items = await self.fetch_detail_items(details_url)
+            for item in items:
                 try:
-                    label = (await items.nth(j).locator(".sale-detail-label").inner_text()).strip()
-                    val = (await items.nth(j).locator(".sale-detail-value").inner_text()).strip()
-                    label_low = label.lower()
+                    field = classify_detail_label(item["label"].strip())
+                    val = item["value"].strip()
                     
-                    if "address" in label_low:
-                        try:
-                            val_html = await items.nth(j).locator(".sale-detail-value").inner_html()
-                            val_html = re.sub(r"<br\s*/?>", " ", val_html)
-                            val_clean = re.sub(r"<.*?>", "", val_html).strip()
-                            if not extracted["address"] or len(val_clean) > len(extracted["address"]):
-                                extracted["address"] = val_clean
-                        except Exception:
-                            if not extracted["address"]:
-                                extracted["address"] = val
+                    if field == "address":
+                        val_clean = norm_text(val)
+                        if not extracted["address"] or len(val_clean) > len(extracted["address"]):
+                            extracted["address"] = val_clean
                                 
-                    elif ("Approx. Judgment" in label or "Approx. Upset" in label
-                        or "Approximate Judgment:" in label or "Approx Judgment*" in label 
-                        or "Approx. Upset*" in label or "Debt Amount" in label):
+                    elif field == "approx_judgment":
                         extracted["approx_judgment"] = val
                         
-                    elif "defendant" in label_low and not extracted["defendant"]:
-                        extracted["defendant"] = val
-                        
-                    elif "sale" in label_low and "date" in label_low and not extracted["sales_date"]:
-                        extracted["sales_date"] = val
+                    elif field in ("defendant", "sales_date") and not extracted[field]:
+                        extracted[field] = val
                         
-                    elif county["county_id"] == "24" and "sale type" in label_low:
+                    elif field == "sale_type" and county["county_id"] == "24":
                         extracted["sale_type"] = val
                         
                 except Exception:
@@ -327,82 +717,90 @@ class ForeclosureScraper:
                     
         except Exception as e:
             print(f"⚠ Details page error for {county['county_name']}: {e}")
-        finally:
-            # Return to list page
-            try:
-                await self.goto_with_retry(page, list_url)
-                await self.dismiss_banners(page)
-                await page.wait_for_selector("table.table.table-striped tbody tr, .no-sales, #noData", timeout=30000)
-            except Exception:
-                pass
                 
         return extracted
 
-    async def safe_get_cell_text(self, row, colmap, colname):
-        """Safely extract text from table cell by column name."""
-        try:
-            idx = colmap.get(colname)
-            if idx is None:
-                return ""
-            # Get all cells first to avoid issues with nth() selector
-            cells = await row.locator("td").all()
-            if idx < len(cells):
-                txt = await cells[idx].inner_text()
-                return re.sub(r"\s+", " ", txt).strip()
-            return ""
-        except Exception:
-            return ""
-
-    async def scrape_county_sales(self, page, county):
-        """Main scraping function that handles different table structures dynamically."""
+    async def scrape_county_sales(self, page, county, known_ids=frozenset()):
+        """
+        Main scraping function that handles different table structures dynamically.
+        Rows whose Property ID is in known_ids are already in the sheet, so their
+        details pages are not visited and they are left out of the result.
+        Returns (records, skipped), skipped being the number of known rows left out
+        (repeats of a property within the listing are dropped but not counted).
+        """
         url = f"{BASE_URL}Sales/SalesSearch?countyId={county['county_id']}"
         print(f"[INFO] Scraping {county['county_name']} -> {url}")
 
         for attempt in range(MAX_RETRIES):
             try:
                 await self.goto_with_retry(page, url)
-                await self.dismiss_banners(page)
 
                 try:
                     await page.wait_for_selector("table.table.table-striped tbody tr, .no-sales, #noData", timeout=30000)
                 except PlaywrightTimeoutError:
                     print(f"[WARN] No sales found for {county['county_name']}")
-                    return []
+                    return [], 0
+
+                table = await page.evaluate(LISTING_JS)
 
                 # Build column mapping from headers
-                colmap = await self.get_table_columns(page)
+                colmap = column_map(table["headers"])
                 if not colmap:
                     print(f"[WARN] Could not determine table structure for {county['county_name']}")
-                    return []
+                    return [], 0
 
-                rows = page.locator("table.table.table-striped tbody tr")
-                n = await rows.count()
-                results = []
+                rows = table["rows"]
 
-                for i in range(n):
-                    row = rows.nth(i)
-                    details_a = row.locator("td.hidden-print a")
-                    details_href = (await details_a.get_attribute("href")) or ""
-                    details_url = details_href if details_href.startswith("http") else urljoin(BASE_URL, details_href)
+                # Pass 1: collect listing fields so we never have to navigate back
+                listing = []
+                skipped = 0
+                repeats = 0
+                seen_ids = set()  # listings can repeat a property; fetch and write it once
+                for row in rows:
+                    details_href = row["href"]
                     property_id = extract_property_id_from_href(details_href)
+                    if property_id in known_ids:
+                        skipped += 1
+                        continue
+                    if property_id in seen_ids:
+                        repeats += 1
+                        continue
+                    if property_id:
+                        seen_ids.add(property_id)
+                    details_url = details_url_for(details_href)
 
                     # Get values by column name
-                    sales_date = await self.safe_get_cell_text(row, colmap, "sales_date")
-                    defendant = await self.safe_get_cell_text(row, colmap, "defendant")
-                    prop_address = await self.safe_get_cell_text(row, colmap, "address")
-
-                    # Get additional data from details page
-                    current_data = {
-                        "address": prop_address,
-                        "defendant": defendant,
-                        "sales_date": sales_date
-                    }
-                    
-                    details_data = await self.get_details_data(page, details_url, url, county, current_data)
+                    cells = row["cells"]
+                    listing.append({
+                        "property_id": property_id,
+                        "details_url": details_url,
+                        "current_data": {
+                            "address": cell_text(cells, colmap, "address"),
+                            "defendant": cell_text(cells, colmap, "defendant"),
+                            "sales_date": cell_text(cells, colmap, "sales_date"),
+                            "approx_judgment": cell_text(cells, colmap, "approx_judgment"),
+                        },
+                    })
+
+                if skipped:
+                    print(f"[INFO] {county['county_name']}: skipping {skipped} already-known rows")
+                if repeats:
+                    print(f"[INFO] {county['county_name']}: dropping {repeats} repeated listing rows")
+
+                # Pass 2: fetch details pages concurrently (HTTP first, pooled pages as fallback)
+                sem = asyncio.Semaphore(MAX_PARALLEL_DETAILS)
+
+                async def fetch_detail(rec):
+                    async with sem:
+                        return await self.get_details_data(rec["details_url"], county, rec["current_data"])
+
+                details = await asyncio.gather(*(fetch_detail(rec) for rec in listing))
 
+                results = []
+                for rec, details_data in zip(listing, details):
                     # Build result row
                     row_data = {
-                        "Property ID": property_id,
+                        "Property ID": rec["property_id"],
                         "Address": details_data["address"],
                         "Defendant": details_data["defendant"],
                         "Sales Date": details_data["sales_date"],
@@ -416,39 +814,14 @@ class ForeclosureScraper:
 
                     results.append(row_data)
 
-                return results
+                return results, skipped
 
             except Exception as e:
                 print(f"❌ Error scraping {county['county_name']} (Attempt {attempt+1}/{MAX_RETRIES}): {e}")
-                await asyncio.sleep(2 ** attempt)
+                await asyncio.sleep(backoff_delay(attempt))
 
         print(f"[FAIL] Could not get complete data for {county['county_name']}")
-        return []
-
-    async def get_table_columns(self, page):
-        """Get column mapping based on headers to handle different table structures."""
-        try:
-            header_ths = page.locator("table.table.table-striped thead tr th")
-            if await header_ths.count() == 0:
-                header_ths = page.locator("table.table.table-striped tr").first.locator("th")
-            
-            colmap = {}
-            for i in range(await header_ths.count()):
-                try:
-                    htxt = (await header_ths.nth(i).inner_text()).strip().lower()
-                    if "sale" in htxt and "date" in htxt:
-                        colmap["sales_date"] = i
-                    elif "defendant" in htxt:
-                        colmap["defendant"] = i
-                    elif "address" in htxt:
-                        colmap["address"] = i
-                except Exception:
-                    continue
-            
-            return colmap
-        except Exception as e:
-            print(f"[ERROR] Failed to get column mapping: {e}")
-            return {}
+        return [], 0
 
 # -----------------------------
 # Orchestration
@@ -474,69 +847,125 @@ async def run():
     first_run = not sheets.sheet_exists(ALL_DATA_SHEET)
     print(f"ℹ First run? {'YES' if first_run else 'NO'}")
 
+    # Create every missing county tab up front in one batchUpdate. 'All Data' is left
+    # alone: its absence is what marks a first run if this one fails before writing it.
+    created_tabs = set(sheets.ensure_sheets([c["county_name"][:30] for c in TARGET_COUNTIES]))
+
     all_data_rows = []
+    rows_by_county = {}
+    skipped_by_county = {}
+
+    def is_fresh_tab(county_tab):
+        # nothing to dedup against: the whole scrape is written as a new snapshot
+        return first_run or county_tab in created_tabs or not sheets.sheet_exists(county_tab)
+
+    # Read the key columns of every tab we dedup against in one values.batchGet, in the background
+    county_tabs = [c["county_name"][:30] for c in TARGET_COUNTIES]
+    prefetch_ranges = []
+    if not first_run:
+        prefetch_ranges = [
+            f"'{tab}'!{PID_RANGE}" for tab in county_tabs if not is_fresh_tab(tab)
+        ] + [f"'{ALL_DATA_SHEET}'!{COUNTY_PID_RANGE}"]
+    prefetch = asyncio.create_task(asyncio.to_thread(sheets.batch_get, prefetch_ranges))
+
+    async def existing_values():
+        try:
+            return await prefetch
+        except Exception as e:
+            print(f"⚠ Could not prefetch existing sheet values: {e}")
+            return {}
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        scraper = ForeclosureScraper(sheets)
+    async def sheet_ids_for(county_tab):
+        """Property IDs currently in a county tab, or None if the tab could not be read."""
+        existing = (await existing_values()).get(f"'{county_tab}'!{PID_RANGE}")
+        if existing is None:
+            return None
+        _, keys = dedup_against_sheet(existing, [], PID_KEY)
+        return frozenset(k[0] for k in keys)
 
-        for county in TARGET_COUNTIES:
-            county_tab = county["county_name"][:30]
-            try:
-                county_records = await scraper.scrape_county_sales(page, county)
-                if not county_records:
+    def process_county(county, county_records, sheet_ids=None, skipped=0):
+        county_tab = county["county_name"][:30]
+        try:
+            if isinstance(county_records, Exception):
+                raise county_records
+            if not county_records:
+                if skipped:
+                    # everything listed is already in the tab: a normal steady-state run
+                    print(f"✓ No new rows for {county['county_name']} ({skipped} already known)")
+                else:
                     print(f"⚠ No data for {county['county_name']}")
-                    await asyncio.sleep(POLITE_DELAY_SECONDS)
-                    continue
-
-                df_county = pd.DataFrame(county_records)
+                return
+
+            # dynamic header (skip County col)
+            county_header = [col for col in county_records[0] if col != "County"]
+            rows = [[rec[col] for col in county_header] for rec in county_records]
+
+            if is_fresh_tab(county_tab):
+                sheets.create_sheet_if_missing(county_tab)
+                sheets.overwrite_with_snapshot(county_tab, county_header, rows)
+            elif sheet_ids is None:
+                # without the tab's current IDs a prepend could duplicate rows
+                print(f"⚠ Could not read existing IDs for {county['county_name']}; not updating its tab")
+            else:
+                known = {(pid,) for pid in sheet_ids}
+                new_rows, _ = dedup_against_sheet([], rows, PID_KEY, known)
+                if not new_rows:
+                    print(f"✓ No new rows for {county['county_name']}")
+                else:
+                    sheets.prepend_snapshot(county_tab, county_header, new_rows)
 
-                # dynamic header (skip County col)
-                county_columns = [col for col in df_county.columns if col != "County"]
-                county_header = county_columns
+            rows_by_county[county["county_id"]] = [list(rec.values()) for rec in county_records]
+            print(f"✓ Completed {county['county_name']}: {len(county_records)} new records, {skipped} already known")
+        except Exception as e:
+            print(f"❌ Failed county '{county['county_name']}': {e}")
 
-                if first_run or not sheets.sheet_exists(county_tab):
-                    sheets.create_sheet_if_missing(county_tab)
-                    rows = df_county.drop(columns=["County"]).astype(str).values.tolist()
-                    sheets.overwrite_with_snapshot(county_tab, county_header, rows)
-                else:
-                    existing = sheets.get_values(county_tab, "A:Z")
-                    existing_ids = set()
-                    if existing:
-                        header_idx = None
-                        for idx, row in enumerate(existing[:5]):
-                            if row and row[0].lower().replace(" ", "") in {"propertyid", "property id"}:
-                                header_idx = idx
-                                break
-                        if header_idx is None:
-                            header_idx = 1 if len(existing) > 1 else 0
-                        for r in existing[header_idx + 1:]:
-                            if not r or (len(r) == 1 and r[0].strip() == ""):
-                                continue
-                            pid = (r[0] or "").strip()
-                            if pid:
-                                existing_ids.add(pid)
-
-                    new_df = df_county[~df_county["Property ID"].isin(existing_ids)].copy()
-                    if new_df.empty:
-                        print(f"✓ No new rows for {county['county_name']}")
-                    else:
-                        new_rows = new_df.drop(columns=["County"]).astype(str).values.tolist()
-                        sheets.prepend_snapshot(county_tab, county_header, new_rows)
-
-                all_data_rows.extend(df_county.astype(str).values.tolist())
-                print(f"✓ Completed {county['county_name']}: {len(df_county)} records")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+        # one shared context: request blocking and banner script are set up once
+        ctx = await browser.new_context(viewport={"width": 1280, "height": 800})
+        ctx.set_default_navigation_timeout(NAV_TIMEOUT_MS)
+        await ctx.route("**/*", block_unneeded_requests)
+        await ctx.add_init_script(BANNER_DISMISS_JS)
+        detail_pages = PagePool(ctx, MAX_PARALLEL_COUNTIES * MAX_PARALLEL_DETAILS)
+        scraper = ForeclosureScraper(sheets, detail_pages, ctx.request)
+        sem = asyncio.Semaphore(MAX_PARALLEL_COUNTIES)
+
+        async def worker(county):
+            # each county gets its own page so they can run side by side
+            county_tab = county["county_name"][:30]
+            # IDs already in the tab: their details pages are skipped, and the rest is deduped against them
+            sheet_ids = None if is_fresh_tab(county_tab) else await sheet_ids_for(county_tab)
+            async with sem:
+                skipped = 0
+                try:
+                    page = await ctx.new_page()
+                    try:
+                        records, skipped = await scraper.scrape_county_sales(page, county, sheet_ids or frozenset())
+                    finally:
+                        await page.close()
+                except Exception as e:
+                    records = e
+                skipped_by_county[county["county_id"]] = skipped
+                # only queues batchUpdate requests (no network), so it runs inline
+                process_county(county, records, sheet_ids, skipped)
                 await asyncio.sleep(POLITE_DELAY_SECONDS)
-            except Exception as e:
-                print(f"❌ Failed county '{county['county_name']}': {e}")
-                continue
 
+        await asyncio.gather(*(worker(c) for c in TARGET_COUNTIES))
+        await detail_pages.close()
+        await ctx.close()
         await browser.close()
 
+    existing_by_range = await existing_values()
+
+    # keep 'All Data' in TARGET_COUNTIES order regardless of which county finished first
+    for county in TARGET_COUNTIES:
+        all_data_rows.extend(rows_by_county.get(county["county_id"], []))
+
     # --- All Data sheet ---
     try:
-        if not all_data_rows:
+        if not all_data_rows and any(skipped_by_county.values()):
+            print("✓ No new rows for 'All Data'")
+        elif not all_data_rows:
             print("⚠ No data scraped across all counties. Skipping 'All Data'.")
         else:
             # default columns
@@ -547,52 +976,22 @@ async def run():
             if has_new_castle:
                 # Force Sale Type to always be last
                 header_all = ["Property ID", "Address", "Defendant", "Sales Date", "Approx Judgment", "County", "Sale Type"]
-                padded_rows = []
+                # rows are built in record order [PID, Addr, Def, Date, Judgment, County(, Sale Type)],
+                # so only the 6-column ones need padding, and that can happen in place
                 for row in all_data_rows:
-                    if len(row) == 6:  # no Sale Type
-                        # row = [PID, Addr, Def, Date, Judgment, County]
-                        padded_row = row[:5] + [row[5]] + [""]
-                        padded_rows.append(padded_row)
-                    elif len(row) == 7:
-                        # Ensure Sale Type is last
-                        padded_row = row[:5] + [row[5]] + [row[6]]
-                        padded_rows.append(padded_row)
-                    else:
-                        padded_rows.append(row)
-                all_data_rows = padded_rows
+                    if len(row) == 6:
+                        row.append("")
             else:
                 header_all = standard_cols
 
             sheets.create_sheet_if_missing(ALL_DATA_SHEET)
+            existing = existing_by_range.get(f"'{ALL_DATA_SHEET}'!{COUNTY_PID_RANGE}")
             if first_run:
                 sheets.overwrite_with_snapshot(ALL_DATA_SHEET, header_all, all_data_rows)
+            elif existing is None:
+                print("⚠ Could not read existing 'All Data' keys; not updating it")
             else:
-                existing = sheets.get_values(ALL_DATA_SHEET, "A:Z")
-                existing_pairs = set()
-                if existing:
-                    header_idx = None
-                    for idx, row in enumerate(existing[:5]):
-                        if row and row[0].lower().replace(" ", "") in {"propertyid", "property id"}:
-                            header_idx = idx
-                            break
-                    if header_idx is None:
-                        header_idx = 1 if len(existing) > 1 else 0
-                    for r in existing[header_idx + 1:]:
-                        if not r or (len(r) == 1 and r[0].strip() == ""):
-                            continue
-                        pid = (r[0] if len(r) > 0 else "").strip()
-                        county_col_idx = 5  # county is always before Sale Type now
-                        cty = (r[county_col_idx] if len(r) > county_col_idx else "").strip()
-                        if pid and cty:
-                            existing_pairs.add((cty, pid))
-
-                new_rows = []
-                for r in all_data_rows:
-                    pid = (r[0] if len(r) > 0 else "").strip()
-                    county_col_idx = 5
-                    cty = (r[county_col_idx] if len(r) > county_col_idx else "").strip()
-                    if pid and cty and (cty, pid) not in existing_pairs:
-                        new_rows.append(r)
+                new_rows, _ = dedup_against_sheet(existing, all_data_rows, COUNTY_PID_KEY)
 
                 if not new_rows:
                     print("✓ No new rows for 'All Data'")
@@ -602,6 +1001,11 @@ async def run():
     except Exception as e:
         print(f"✗ Error updating 'All Data': {e}")
 
+    # one batchUpdate for every tab touched above
+    try:
+        sheets.flush_batched()
+    except Exception as e:
+        print(f"✗ Error writing snapshots to Google Sheets: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# test_dedup.py
+from main import COUNTY_PID_KEY, PID_KEY, _data_start, dedup_against_sheet
+
+HEADER = ["Property ID", "Address", "Defendant", "Plaintiff", "Sales Date", "County", "Sale Type"]
+
+
+def row(pid, county="Camden County, NJ"):
+    return [pid, "1 Main St", "DOE", "BANK", "1/2/2026", county, "Sheriff Sale"]
+
+
+def test_data_start_after_snapshot_title():
+    existing = [["Snapshot for 2026-10-15 06:00"], HEADER, row("1")]
+    assert _data_start(existing) == 2
+
+
+def test_data_start_without_header():
+    assert _data_start([["1"], ["2"], ["3"]]) == 2
+    assert _data_start([["1"]]) == 1
+
+
+def test_existing_ids_are_skipped():
+    existing = [["Snapshot for 2026-10-15 06:00"], HEADER, row(" 1 "), row("2")]
+    new_rows, keys = dedup_against_sheet(existing, [row("1"), row("3")], PID_KEY)
+    assert new_rows == [row("3")]
+    assert keys == {("1",), ("2",)}
+
+
+def test_known_keys_override_sheet_values():
+    existing = [HEADER, row("1")]
+    new_rows, keys = dedup_against_sheet(existing, [row("1"), row("2")], PID_KEY, {("2",)})
+    assert new_rows == [row("1")]
+    assert keys == {("2",)}
+
+
+def test_short_rows_and_empty_keys_are_dropped():
+    existing = [HEADER, [""], ["1"], row("")]
+    new_rows, keys = dedup_against_sheet(existing, [["4"], row(""), row("5")], COUNTY_PID_KEY)
+    assert new_rows == [row("5")]
+    assert keys == frozenset()
+
+
+def test_all_data_keys_on_county_and_property_id():
+    existing = [HEADER, row("1", "Camden County, NJ")]
+    rows = [row("1", "Camden County, NJ"), row("1", "Essex County, NJ")]
+    new_rows, keys = dedup_against_sheet(existing, rows, COUNTY_PID_KEY)
+    assert new_rows == [row("1", "Essex County, NJ")]
+    assert keys == {("Camden County, NJ", "1")}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_"):
+            fn()
+            print("ok", name)
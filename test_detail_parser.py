@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# test_detail_parser.py
+from main import DetailItemsParser
+
+DETAILS_HTML = """
+<html><body>
+<div class="sale-details-list">
+  <div class="sale-detail-item">
+    <div class="sale-detail-label">Sheriff #:</div>
+    <div class="sale-detail-value">F-12345</div>
+  </div>
+  <div class="sale-detail-item">
+    <div class="sale-detail-label">Address:</div>
+    <div class="sale-detail-value">123 Main St<br/>Camden&nbsp;NJ 08101</div>
+  </div>
+  <div class="sale-detail-item">
+    <div class="sale-detail-label">Property Address:</div>
+    <div class="sale-detail-value"><div>45 Oak Ave</div><div>Cherry Hill NJ</div></div>
+  </div>
+  <div class="sale-detail-item">
+    <div class="sale-detail-label">Defendant:</div>
+    <div class="sale-detail-value"><p>JOHN DOE<p>JANE DOE &amp; CO</div>
+  </div>
+  <div class="sale-detail-item">
+    <span class="sale-detail-label">Approx. Judgment*:</span>
+    <span class="sale-detail-value"><b>$123,456.78</b></span>
+  </div>
+</div>
+</body></html>
+"""
+
+
+def parse(html):
+    parser = DetailItemsParser()
+    parser.feed(html)
+    return parser.items
+
+
+def test_details_page_items():
+    assert parse(DETAILS_HTML) == [
+        {"label": "Sheriff #:", "value": "F-12345"},
+        {"label": "Address:", "value": "123 Main St Camden NJ 08101"},
+        {"label": "Property Address:", "value": "45 Oak Ave Cherry Hill NJ"},
+        {"label": "Defendant:", "value": "JOHN DOE JANE DOE & CO"},
+        {"label": "Approx. Judgment*:", "value": "$123,456.78"},
+    ]
+
+
+def test_nested_blocks_are_separated():
+    html = ('<div class="sale-detail-item"><div class="sale-detail-label">Address:</div>'
+            '<div class="sale-detail-value"><div>123 Main St</div><div>Camden NJ</div></div></div>')
+    assert parse(html) == [{"label": "Address:", "value": "123 Main St Camden NJ"}]
+
+
+def test_unclosed_list_items_do_not_swallow_next_item():
+    html = ('<div class="sale-detail-item"><div class="sale-detail-label">Defendant:</div>'
+            '<div class="sale-detail-value"><ul><li>A<li>B</ul></div></div>'
+            '<div class="sale-detail-item"><div class="sale-detail-label">Sales Date:</div>'
+            '<div class="sale-detail-value">1/2/2026</div></div>')
+    assert parse(html) == [
+        {"label": "Defendant:", "value": "A B"},
+        {"label": "Sales Date:", "value": "1/2/2026"},
+    ]
+
+
+def test_page_without_details_list():
+    assert parse("<html><body><table><tr><td>No sales</td></tr></table></body></html>") == []
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_"):
+            fn()
+            print("ok", name)